@@ -1,22 +1,51 @@
-from flask import Flask, render_template, request, redirect, url_for, flash, session, g
+from flask import Flask, Blueprint, render_template, stream_template, request, redirect, url_for, flash, get_flashed_messages, session, g, current_app
+from flask.cli import with_appcontext
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import OperationalError
 from werkzeug.security import generate_password_hash, check_password_hash
 from datetime import datetime, date
-import sqlite3
+import click
 import difflib
+import os
 import random
 import re # This is the library used for regular expressions
 
-# --- Flask Application Setup ---
-app = Flask(__name__)
-app.config['SECRET_KEY'] = 'a_very_long_and_random_secret_key_for_production_use'  # Should be replaced with env var in production
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///user_information.db' # SQLAlchemy will manage this database
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False  # Disables modification tracking to save resources
-
-db = SQLAlchemy(app)  # Initialize SQLAlchemy with our Flask app
-
-# --- External Database Paths (for Popular Games, read-only) ---
-POPULAR_GAMES_DATABASE = 'Popular_Games.db' # This database will still be accessed directly via sqlite3
+from assets import assets_bp, build_assets_command, get_asset_manifest
+from catalog import SORT_KEYS, load_catalog
+from compression import CompressionMiddleware
+
+# --- Configuration ---
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+class Config:
+    # Default settings - override any of these by passing a dict to create_app()
+    SECRET_KEY = 'a_very_long_and_random_secret_key_for_production_use'  # Should be replaced with env var in production
+    SQLALCHEMY_DATABASE_URI = 'sqlite:///user_information.db' # SQLAlchemy will manage this database
+    SQLALCHEMY_TRACK_MODIFICATIONS = False  # Disables modification tracking to save resources
+    # Connection pool for user_information.db - each gunicorn worker gets its own pool after fork.
+    # Applied by create_app() (in-memory SQLite has a single shared connection, so no pool there)
+    USER_DB_POOL_SIZE = 5
+    USER_DB_MAX_OVERFLOW = 5
+    # External database (Popular Games, read-only) - loaded into memory once as the catalog
+    POPULAR_GAMES_DATABASE = os.path.join(BASE_DIR, 'Popular_Games.db')
+    # Fingerprinted static files (see assets.py) - built into static/dist and cached by browsers for a year
+    ASSET_DIST_FOLDER = 'dist'
+    ASSET_MAX_AGE = 365 * 24 * 60 * 60
+    # Stream the catalog pages (home, my_games) to the browser while they render, instead of building them in memory first
+    # Trade-off (see bench_streaming.py): much faster first byte and flat memory, but somewhat slower in total.
+    # Turn it off per deployment with create_app({'STREAM_TEMPLATES': False}) (gunicorn.conf.py does this for STREAM_TEMPLATES=0)
+    STREAM_TEMPLATES = True
+    STREAM_BUFFER_SIZE = 8 * 1024 # Characters of HTML collected before each piece is sent
+    # On-the-fly gzip/brotli compression of responses (see compression.py)
+    COMPRESSION_ENABLED = True
+    COMPRESSION_MIN_SIZE = 500 # Bytes - smaller responses aren't worth compressing
+    COMPRESSION_CHUNK_SIZE = 16 * 1024 # Flush compressed output after this many bytes of page
+    COMPRESSION_GZIP_LEVEL = 6
+    COMPRESSION_BROTLI_QUALITY = 5
+
+db = SQLAlchemy()  # Bound to the app inside create_app()
+bp = Blueprint('main', __name__)  # All of the site's routes live on this blueprint
 
 # --- Database Models (managed by Flask-SQLAlchemy) ---
 class User(db.Model):
@@ -47,38 +76,53 @@ class UserGame(db.Model):
         return f'<UserGame UserID:{self.user_id} GameID:{self.game_id}>'
 
 
-# --- Database connection functions for Popular_Games.db (read-only) ---
-def get_popular_games_db():
+# --- Catalog (Popular_Games.db, read-only) ---
+def get_catalog():
     """
-    Establishes a connection to the Popular_Games.db database.
-    Stores the connection in Flask's global 'g' object to reuse it within a request.
-    Configures the connection to return rows as sqlite3.Row objects.
+    Returns the in-memory catalog of all games from Popular_Games.db.
+    It is loaded lazily on first use, unless warm_up() already loaded it in the gunicorn master.
     """
-    db_conn = getattr(g, '_popular_games_database', None)
-    if db_conn is None:
-        # Create new connection if it doesn't exist yet
-        db_conn = g._popular_games_database = sqlite3.connect(POPULAR_GAMES_DATABASE)
-        db_conn.row_factory = sqlite3.Row  # Enable dictionary-like access to columns
-    return db_conn
+    catalog = current_app.extensions.get('catalog')
+    if catalog is None:
+        catalog = current_app.extensions['catalog'] = load_catalog(current_app.config['POPULAR_GAMES_DATABASE'])
+    return catalog
 
-# Database connection cleanup for Popular_Games.db
-@app.teardown_appcontext
-def close_db_connections(exception):
+def render_catalog_page(template_name, **context):
     """
-    Closes database connections that were opened during the request.
-    This specifically closes the connection to Popular_Games.db.
-    SQLAlchemy connections are managed automatically.
+    Renders a page that lists catalog games.
+    With STREAM_TEMPLATES on, the HTML is sent in pieces as the template produces it, so the browser
+    starts receiving the page straight away and the whole page is never held in memory.
     """
-    db_pop_games = getattr(g, '_popular_games_database', None)
-    if db_pop_games is not None:
-        db_pop_games.close()
+    if not current_app.config['STREAM_TEMPLATES']:
+        return render_template(template_name, **context)
+    # The session cookie is sent before a streamed body, so flashed messages have to be taken out of it now.
+    # Flask keeps them on the request, so the template's get_flashed_messages() still sees them.
+    get_flashed_messages()
+    return buffer_stream(stream_template(template_name, **context), current_app.config['STREAM_BUFFER_SIZE'])
 
-# --- Setup for SQLAlchemy (to create tables for User and UserGame) ---
-with app.app_context():
-    db.create_all() # This creates tables for User and UserGame in database.db if they don't exist
+def buffer_stream(pieces, buffer_size):
+    """
+    Joins the many tiny pieces a streamed template produces into chunks of about buffer_size.
+    The first piece (the top of the page) is sent on its own straight away so the browser can start loading CSS.
+    """
+    pieces = iter(pieces)
+    for first_piece in pieces:
+        yield first_piece
+        break
+    buffer = []
+    buffered = 0
+    for piece in pieces:
+        buffer.append(piece)
+        buffered += len(piece)
+        if buffered >= buffer_size:
+            yield ''.join(buffer)
+            buffer = []
+            buffered = 0
+    if buffer:
+        yield ''.join(buffer)
 
 # --- Context Processor for Global Variables (e.g., datetime for footer) ---
-@app.before_request
+@bp.before_app_request
 def before_request():
     # Make datetime available in all templates
     g.datetime = datetime
@@ -137,81 +181,33 @@ def is_valid_username(username):
         return False
     return True
 
-# Big SQL query for fetching game data with all its related information (platforms, ratings, etc.)
-GAME_SELECT = """
-SELECT
-    g.game_id,
-    g.title,
-    g.genre,
-    g.release_date,
-    g.metacritic_score,
-    g.description,
-    d.name AS developer,
-    pub.name AS publisher,
-    ar.rating AS age_rating,
-    ar.reason AS age_rating_reason,
-    i.cover_image,
-    i.image_url,
-    i.image_url2,
-    i.image_url3,
-    pr.price AS price,
-    pr.currency AS currency,
-    p1.platform_name AS platform_name1,
-    p2.platform_name AS platform_name2,
-    p3.platform_name AS platform_name3,
-    p4.platform_name AS platform_name4,
-    p5.platform_name AS platform_name5,
-    p6.platform_name AS platform_name6,
-    p7.platform_name AS platform_name7,
-    p8.platform_name AS platform_name8
-FROM games g
-JOIN developers d ON g.developer_id = d.developer_id
-JOIN publishers pub ON g.publisher_id = pub.publisher_id
-JOIN age_ratings ar ON g.age_rating_id = ar.age_rating_id
-JOIN images i ON g.game_id = i.game_id
-LEFT JOIN prices pr ON g.game_id = pr.game_id
-LEFT JOIN game_platforms gp ON g.game_id = gp.game_id
-LEFT JOIN platforms p1 ON gp.platform_id = p1.platform_id
-LEFT JOIN platforms p2 ON gp.platform_id2 = p2.platform_id
-LEFT JOIN platforms p3 ON gp.platform_id3 = p3.platform_id
-LEFT JOIN platforms p4 ON gp.platform_id4 = p4.platform_id
-LEFT JOIN platforms p5 ON gp.platform_id5 = p5.platform_id
-LEFT JOIN platforms p6 ON gp.platform_id6 = p6.platform_id
-LEFT JOIN platforms p7 ON gp.platform_id7 = p7.platform_id
-LEFT JOIN platforms p8 ON gp.platform_id8 = p8.platform_id
-"""
 # --- Flask Routes ---
-@app.route('/')
+@bp.route('/')
 def home():
     """
     Home page route.
     Displays a list of all games from the Popular_Games.db database.
+    Optional ?sort=price|score|release_date|title and ?order=desc query parameters pick the ordering.
     """
-    conn = get_popular_games_db()
-    games = conn.execute(GAME_SELECT).fetchall()  # Get all games from database
-    
-    processed_games = []
-    for game_row in games:
-        # Convert SQLite Row to dictionary for easier manipulation
-        game_dict = dict(game_row)
-        platforms_list = []
-        # Collect platforms from potentially multiple platform_nameX columns
-        for i in range(1, 9):
-            platform_key = f'platform_name{"" if i == 1 else i}'
-            if game_dict.get(platform_key):
-                platforms_list.append(game_dict[platform_key])
-        # Use set to remove duplicate platforms
-        game_dict['platforms_display'] = list(set(platforms_list)) 
-        processed_games.append(game_dict)
-
-    return render_template("index.html", all_games=processed_games)
-
-@app.route('/register', methods=['GET', 'POST'])
+    catalog = get_catalog()
+    sort = request.args.get('sort', '')
+    descending = request.args.get('order') == 'desc'
+
+    # Games come straight from the in-memory catalog, no database query per request
+    if sort in SORT_KEYS:
+        all_games = catalog.ordered(sort, descending=descending)
+    else:
+        sort = ''
+        all_games = catalog.games
+
+    return render_catalog_page("index.html", all_games=all_games, sort=sort, descending=descending)
+
+@bp.route('/register', methods=['GET', 'POST'])
 def register():
     # If user is already logged in, redirect to home
     if session.get('user_id'):
         flash('You are already logged in.', 'info')
-        return redirect(url_for('home'))
+        return redirect(url_for('main.home'))
 
     # Get today's date for use in the template to set max attribute for DOB input
     today_date_str = date.today().strftime('%Y-%m-%d')
@@ -227,32 +223,32 @@ def register():
         # Validation - check if all fields are filled
         if not username or not email or not password or not confirm_password or not dob:
             flash('All fields are required!', 'danger')
-            return redirect(url_for('register'))
+            return redirect(url_for('main.register'))
 
         # Username validation - check format
         if not is_valid_username(username):
             flash('Username must be 3-20 characters long and contain only letters, numbers, and underscores.', 'danger')
-            return redirect(url_for('register'))
+            return redirect(url_for('main.register'))
 
         # Email validation
         if not is_valid_email(email):
             flash('Please enter a valid email address.', 'danger')
-            return redirect(url_for('register'))
+            return redirect(url_for('main.register'))
 
         # Password complexity validation
         if not is_strong_password(password):
             flash('Password must be at least 8 characters long and include uppercase, lowercase, numbers, and special characters.', 'danger')
-            return redirect(url_for('register'))
+            return redirect(url_for('main.register'))
 
         # Password match validation
         if password != confirm_password:
             flash('Passwords do not match.', 'danger')
-            return redirect(url_for('register'))
+            return redirect(url_for('main.register'))
 
         # Validate DOB format and minimum/maximum age
         if not re.match(r"^\d{4}-\d{2}-\d{2}$", dob):
             flash('Invalid date format. Please use YYYY-MM-DD.', 'danger')
-            return redirect(url_for('register'))
+            return redirect(url_for('main.register'))
         
         try:
             birth_date_obj = datetime.strptime(dob, "%Y-%m-%d").date()
@@ -260,26 +256,26 @@ def register():
             min_dob_allowed = date(1925, 1, 1) # Nothing before 1925
         except ValueError:
             flash('Invalid date of birth provided. Please use a valid date.', 'danger')
-            return redirect(url_for('register'))
+            return redirect(url_for('main.register'))
 
         # DOB validations - can't be in future
         if birth_date_obj > current_date:
             flash('Date of birth cannot be in the future.', 'danger')
-            return redirect(url_for('register'))
+            return redirect(url_for('main.register'))
 
         # DOB validations - can't be too old
         if birth_date_obj < min_dob_allowed:
             flash(f'Date of birth cannot be before {min_dob_allowed.year}.', 'danger')
-            return redirect(url_for('register'))
+            return redirect(url_for('main.register'))
 
         # Age validation - must be at least 13
         user_age = calculate_age(dob)
         if user_age is None:
             flash('Invalid date of birth provided.', 'danger')
-            return redirect(url_for('register'))
+            return redirect(url_for('main.register'))
         elif user_age < 13: # Example: Minimum age requirement
             flash('You must be at least 13 years old to register.', 'danger')
-            return redirect(url_for('register'))
+            return redirect(url_for('main.register'))
 
         # Check if username or email already exists using SQLAlchemy
         existing_user = User.query.filter(
@@ -291,7 +287,7 @@ def register():
                 flash('Username already exists. Please choose a different one.', 'danger')
             else: # existing_user.email == email
                 flash('Email already exists. Please use a different one or log in.', 'danger')
-            return redirect(url_for('register'))
+            return redirect(url_for('main.register'))
 
         # Hash password for security - never store raw passwords!
         hashed_password = generate_password_hash(password, method='pbkdf2:sha256')
@@ -302,7 +298,7 @@ def register():
             db.session.add(new_user)
             db.session.commit()
             flash('Registration successful! You can now log in.', 'success')
-            return redirect(url_for('login'))
+            return redirect(url_for('main.login'))
         except Exception as e:
             db.session.rollback() # Rollback in case of any database error
             flash(f'An unexpected error occurred during registration. Please try again. Error: {str(e)}', 'danger')
@@ -310,12 +306,12 @@ def register():
 
     return render_template('register.html', today_date_str=today_date_str)
 
-@app.route('/login', methods=['GET', 'POST'])
+@bp.route('/login', methods=['GET', 'POST'])
 def login():
     # If already logged in, redirect to home
     if session.get('user_id'):
         flash('You are already logged in.', 'info')
-        return redirect(url_for('home'))
+        return redirect(url_for('main.home'))
 
     if request.method == 'POST':
         # Get form data
@@ -325,7 +321,7 @@ def login():
         # Check for empty fields
         if not username_or_email or not password:
             flash('Username/Email and Password are required!', 'danger')
-            return redirect(url_for('login'))
+            return redirect(url_for('main.login'))
 
         # Find user by either username or email using SQLAlchemy
         user = User.query.filter(
@@ -339,14 +335,14 @@ def login():
             session['username'] = user.username
             session['email'] = user.email
             flash('Login successful!', 'success')
-            return redirect(url_for('home'))
+            return redirect(url_for('main.home'))
         else:
             flash('Invalid username/email or password.', 'danger')
-            return redirect(url_for('login'))
+            return redirect(url_for('main.login'))
             
     return render_template('login.html')
 
-@app.route('/logout')
+@bp.route('/logout')
 def logout():
     """
     Logs out the current user by clearing session variables.
@@ -356,9 +352,9 @@ def logout():
     session.pop('username', None)
     session.pop('email', None)
     flash('You have been logged out.', 'info')
-    return redirect(url_for('home'))
+    return redirect(url_for('main.home'))
 
-@app.route('/profile')
+@bp.route('/profile')
 def profile():
     """
     Displays the logged-in user's profile information.
@@ -366,7 +362,7 @@ def profile():
     # Require login
     if 'user_id' not in session:
         flash('Please log in to view your profile.', 'info')
-        return redirect(url_for('login'))
+        return redirect(url_for('main.login'))
 
     user = User.query.get(session['user_id']) # Get user by ID using SQLAlchemy
 
@@ -376,14 +372,14 @@ def profile():
         session.pop('user_id', None)  # Clear invalid session data
         session.pop('username', None)
         session.pop('email', None)
-        return redirect(url_for('login'))
+        return redirect(url_for('main.login'))
 
     # Get today's date for use in the template to set max attribute for DOB input
     today_date_str = date.today().strftime('%Y-%m-%d')
 
     return render_template('profile.html', user=user, today_date_str=today_date_str)
 
-@app.route('/update_username', methods=['POST'])
+@bp.route('/update_username', methods=['POST'])
 def update_username():
     """
     Handles updating the user's username.
@@ -391,35 +387,35 @@ def update_username():
     # Require login
     if 'user_id' not in session:
         flash('Please log in to update your username.', 'info')
-        return redirect(url_for('login'))
+        return redirect(url_for('main.login'))
 
     user = User.query.get(session['user_id'])
     if not user:
         flash('User not found.', 'danger')
-        return redirect(url_for('login'))
+        return redirect(url_for('main.login'))
 
     new_username = request.form.get('new_username', '').strip()
 
     # Validation - username can't be empty
     if not new_username:
         flash('New username cannot be empty.', 'danger')
-        return redirect(url_for('profile'))
+        return redirect(url_for('main.profile'))
     
     # No change needed if username is the same
     if new_username == user.username:
         flash('New username is the same as your current username.', 'info')
-        return redirect(url_for('profile'))
+        return redirect(url_for('main.profile'))
 
     # Validate new username format
     if not is_valid_username(new_username):
         flash('New username must be 3-20 characters long and contain only letters, numbers, and underscores.', 'danger')
-        return redirect(url_for('profile'))
+        return redirect(url_for('main.profile'))
 
     # Check if new username is already taken by another user
     existing_user_with_new_username = User.query.filter(User.username == new_username).first()
     if existing_user_with_new_username and existing_user_with_new_username.id != user.id:
         flash('This username is already taken. Please choose a different one.', 'danger')
-        return redirect(url_for('profile'))
+        return redirect(url_for('main.profile'))
 
     try:
         # Update username in database
@@ -432,9 +428,9 @@ def update_username():
         print(f"Database error updating username: {e}")
         flash(f'An unexpected error occurred while updating username: {e}', 'danger')
     
-    return redirect(url_for('profile'))
+    return redirect(url_for('main.profile'))
 
-@app.route('/change_password', methods=['POST'])
+@bp.route('/change_password', methods=['POST'])
 def change_password():
     """
     Handles changing the user's password.
@@ -442,7 +438,7 @@ def change_password():
     # Require login
     if 'user_id' not in session:
         flash('Please log in to change your password.', 'info')
-        return redirect(url_for('login'))
+        return redirect(url_for('main.login'))
 
     old_password = request.form.get('old_password', '').strip()
     new_password = request.form.get('new_password', '').strip()
@@ -457,27 +453,27 @@ def change_password():
         session.pop('user_id', None)  # Clear invalid session data
         session.pop('username', None)
         session.pop('email', None)
-        return redirect(url_for('login'))
+        return redirect(url_for('main.login'))
 
     # Validation - check if all password fields are filled
     if not old_password or not new_password or not confirm_new_password:
         flash('All password fields are required.', 'error')
-        return redirect(url_for('profile'))
+        return redirect(url_for('main.profile'))
 
     # Validation - verify old password
     if not check_password_hash(user.password_hash, old_password):
         flash('Incorrect old password.', 'error')
-        return redirect(url_for('profile'))
+        return redirect(url_for('main.profile'))
 
     # Validation - check if new passwords match
     if new_password != confirm_new_password:
         flash('New passwords do not match.', 'error')
-        return redirect(url_for('profile'))
+        return redirect(url_for('main.profile'))
     
     # Validation - enforce password complexity
     if not is_strong_password(new_password):
         flash('New password must be at least 8 characters long and include uppercase, lowercase, numbers, and special characters.', 'danger')
-        return redirect(url_for('profile'))
+        return redirect(url_for('main.profile'))
 
     try:
         # Update password hash in database
@@ -489,34 +485,20 @@ def change_password():
         print(f"Database error changing password: {e}")
         flash('An unexpected error occurred while updating password.', 'error')
     
-    return redirect(url_for('profile'))
+    return redirect(url_for('main.profile'))
 
-@app.route('/game/<int:game_id>')
+@bp.route('/game/<int:game_id>')
 def game_detail(game_id):
     """
     Displays detailed information for a specific game.
     """
-    popular_games_db = get_popular_games_db()
-    
-    # Query for specific game by ID
-    query = GAME_SELECT + " WHERE g.game_id = ?"
-    game_row = popular_games_db.execute(query, (game_id,)).fetchone()
+    # Look up specific game by ID
+    game = get_catalog().get(game_id)
 
     # Handle case where game doesn't exist
-    if not game_row:
+    if not game:
         flash('Game not found.', 'error')
-        return redirect(url_for('home'))
-    
-    # Parse game data
-    game = dict(game_row)
-    platforms_list = []
-    # Collect all platforms for this game
-    for i in range(1, 9):
-        platform_key = f'platform_name{"" if i == 1 else i}'
-        if game.get(platform_key):
-            platforms_list.append(game[platform_key])
-            # del game[platform_key] # Optional: clean up dict
-    game['platforms_display'] = list(set(platforms_list))
+        return redirect(url_for('main.home'))
 
     # Check if this game is in user's list (if logged in)
     is_game_in_user_list = False
@@ -529,21 +511,20 @@ def game_detail(game_id):
 
     return render_template("game_detail.html", game=game, is_game_in_user_list=is_game_in_user_list)
 
-@app.route("/random")
+@bp.route("/random")
 def random_game():
     """
     Redirects to a random game's detail page.
     """
-    conn = get_popular_games_db()
-    games = conn.execute("SELECT game_id FROM games").fetchall()
+    games = get_catalog().games
     if not games:
         flash("No games available in the database.", 'warning')
-        return redirect(url_for('home'))
+        return redirect(url_for('main.home'))
     # Pick a random game ID and redirect to its detail page
     random_id = random.choice(games)["game_id"]
-    return redirect(url_for("game_detail", game_id=random_id))
+    return redirect(url_for("main.game_detail", game_id=random_id))
 
-@app.route('/my_games')
+@bp.route('/my_games')
 def my_games():
     """
     Displays the logged-in user's personal list of games.
@@ -551,7 +532,7 @@ def my_games():
     # Require login
     if 'user_id' not in session:
         flash('Please log in to view your game list.', 'info')
-        return redirect(url_for('login'))
+        return redirect(url_for('main.login'))
 
     user_id = session['user_id']
     
@@ -563,44 +544,13 @@ def my_games():
     if not game_ids:
         return render_template('my_games.html', user_games=[])
 
-    popular_games_db = get_popular_games_db()
-    # Use IN clause to fetch all details for these game_ids from Popular_Games.db
-    placeholders = ','.join('?' * len(game_ids))
-    
-    query = f"{GAME_SELECT} WHERE g.game_id IN ({placeholders})"
-    games_data_rows = popular_games_db.execute(query, game_ids).fetchall()
-    
-    # Process game data for display
-    user_games = []
-    for g_row in games_data_rows:
-        game_dict = dict(g_row)
-        platforms_list = []
-        # Collect platforms for each game
-        for i in range(1, 9):
-            platform_key = f'platform_name{"" if i == 1 else i}'
-            if game_dict.get(platform_key):
-                platforms_list.append(game_dict[platform_key])
-        
-        # Create a clean game object with only the needed properties
-        user_games.append({
-            'game_id': game_dict['game_id'],
-            'title': game_dict['title'],
-            'genre': game_dict['genre'],
-            'platforms_display': list(set(platforms_list)),
-            'release_date': game_dict['release_date'],
-            'age_rating': game_dict['age_rating'],
-            'publisher': game_dict['publisher'],
-            'developer': game_dict['developer'],
-            'metacritic_score': game_dict['metacritic_score'],
-            'description': game_dict['description'],
-            'cover_image': game_dict.get('cover_image', ''),
-            'price': game_dict.get('price', 'N/A'),
-            'currency': game_dict.get('currency', '')
-        })
-
-    return render_template('my_games.html', user_games=user_games)
-
-@app.route('/add_to_list/<int:game_id>', methods=['POST'])
+    # Fetch the details for these game_ids from the catalog, keeping the most recently added first.
+    # This is a generator, so each game is only looked up as the template reaches it
+    user_games = get_catalog().lookup(game_ids)
+
+    return render_catalog_page('my_games.html', user_games=user_games)
+
+@bp.route('/add_to_list/<int:game_id>', methods=['POST'])
 def add_to_list(game_id):
     """
     Adds a specified game to the logged-in user's personal game list.
@@ -608,17 +558,14 @@ def add_to_list(game_id):
     # Require login
     if 'user_id' not in session:
         flash('Please log in to add games to your list.', 'info')
-        return redirect(url_for('login'))
+        return redirect(url_for('main.login'))
 
     user_id = session['user_id']
 
     # Verify game exists in Popular_Games.db
-    popular_games_db = get_popular_games_db()
-    game_exists = popular_games_db.execute("SELECT 1 FROM games WHERE game_id = ?", (game_id,)).fetchone()
-    
-    if not game_exists:
+    if get_catalog().get(game_id) is None:
         flash('Game not found. Cannot add to your list.', 'error')
-        return redirect(url_for('search'))
+        return redirect(url_for('main.home'))
 
     # Check if game is already in user's list
     existing_entry = UserGame.query.filter_by(user_id=user_id, game_id=game_id).first()
@@ -636,9 +583,9 @@ def add_to_list(game_id):
             print(f"SQLAlchemy error adding game to list: {e}")
             flash('An unexpected error occurred while adding the game.', 'error')
 
-    return redirect(url_for('game_detail', game_id=game_id))
+    return redirect(url_for('main.game_detail', game_id=game_id))
 
-@app.route('/remove_from_list/<int:game_id>', methods=['POST'])
+@bp.route('/remove_from_list/<int:game_id>', methods=['POST'])
 def remove_from_list(game_id):
     """
     Removes a game from the logged-in user's personal game list.
@@ -646,7 +593,7 @@ def remove_from_list(game_id):
     # Require login
     if 'user_id' not in session:
         flash('Please log in to remove games from your list.', 'info')
-        return redirect(url_for('login'))
+        return redirect(url_for('main.login'))
 
     user_id = session['user_id']
     
@@ -668,10 +615,10 @@ def remove_from_list(game_id):
     
     # Redirect back to 'my_games' if that was the referrer, otherwise to game detail
     if request.referrer and 'my_games' in request.referrer:
-        return redirect(url_for('my_games'))
-    return redirect(url_for('game_detail', game_id=game_id))
+        return redirect(url_for('main.my_games'))
+    return redirect(url_for('main.game_detail', game_id=game_id))
 
-@app.route('/update_email', methods=['POST'])
+@bp.route('/update_email', methods=['POST'])
 def update_email():
     """
     Handles updating the user's email address.
@@ -679,35 +626,35 @@ def update_email():
     # Require login
     if 'user_id' not in session:
         flash('Please log in to update your email.', 'info')
-        return redirect(url_for('login'))
+        return redirect(url_for('main.login'))
 
     user = User.query.get(session['user_id'])
     if not user:
         flash('User not found.', 'danger')
-        return redirect(url_for('login'))
+        return redirect(url_for('main.login'))
 
     new_email = request.form.get('new_email', '').strip()
 
     # Validation - email can't be empty
     if not new_email:
         flash('New email cannot be empty.', 'danger')
-        return redirect(url_for('profile'))
+        return redirect(url_for('main.profile'))
 
     # No change needed if email is the same
     if new_email == user.email:
         flash('New email is the same as your current email.', 'info')
-        return redirect(url_for('profile'))
+        return redirect(url_for('main.profile'))
 
     # Validate new email format
     if not is_valid_email(new_email):
         flash('Please enter a valid email address.', 'danger')
-        return redirect(url_for('profile'))
+        return redirect(url_for('main.profile'))
 
     # Check if new email is already taken by another user
     existing_user_with_new_email = User.query.filter(User.email == new_email).first()
     if existing_user_with_new_email and existing_user_with_new_email.id != user.id:
         flash('This email address is already taken by another account. Please choose a different one or log in with that account.', 'danger')
-        return redirect(url_for('profile'))
+        return redirect(url_for('main.profile'))
 
     try:
         # Update email in database
@@ -720,8 +667,85 @@ def update_email():
         print(f"Database error updating email: {e}")
         flash('An unexpected error occurred while updating your email address.', 'error')
 
-    return redirect(url_for('profile'))
+    return redirect(url_for('main.profile'))
+
+# --- Command Line Interface ---
+@click.command('init-db')
+@with_appcontext
+def init_db_command():
+    """Creates the User and UserGame tables in user_information.db if they don't exist."""
+    db.create_all()
+    click.echo('Initialised the user database.')
+
+# --- Application Factory ---
+def is_memory_sqlite(database_uri):
+    """Checks if a database URI is an in-memory SQLite database (e.g. 'sqlite://', used for testing)."""
+    url = make_url(database_uri)
+    return url.drivername.startswith('sqlite') and (
+        url.database in (None, '', ':memory:') or url.query.get('mode') == 'memory')
+
+def create_app(config=None):
+    """
+    Builds and configures the Flask application.
+    Nothing touches a database here - the catalog is loaded on first use or by warm_up().
+    """
+    app = Flask(__name__)
+    app.config.from_object(Config)
+    if config:
+        app.config.update(config)
+
+    # A fresh dict per app - Flask-SQLAlchemy adds to it, and it must not leak into other apps
+    engine_options = dict(app.config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+    if not is_memory_sqlite(app.config['SQLALCHEMY_DATABASE_URI']):
+        engine_options.setdefault('pool_size', app.config['USER_DB_POOL_SIZE'])
+        engine_options.setdefault('max_overflow', app.config['USER_DB_MAX_OVERFLOW'])
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options
+
+    db.init_app(app)
+    app.register_blueprint(bp)
+    app.register_blueprint(assets_bp)
+    app.cli.add_command(init_db_command)
+    app.cli.add_command(build_assets_command)
+
+    if app.config['COMPRESSION_ENABLED']:
+        app.wsgi_app = CompressionMiddleware(
+            app.wsgi_app,
+            min_size=app.config['COMPRESSION_MIN_SIZE'],
+            chunk_size=app.config['COMPRESSION_CHUNK_SIZE'],
+            gzip_level=app.config['COMPRESSION_GZIP_LEVEL'],
+            brotli_quality=app.config['COMPRESSION_BROTLI_QUALITY'],
+        )
+    return app
+
+def warm_up(app):
+    """
+    Loads everything a worker needs before it serves its first request.
+    Called once in the gunicorn master (see gunicorn.conf.py) so forked workers share it copy-on-write.
+    """
+    with app.app_context():
+        # Load the games catalog and the static asset manifest into memory
+        get_catalog()
+        get_asset_manifest()
+
+        # Compile every template now instead of on the first request that uses it
+        for template_name in app.jinja_env.list_templates():
+            app.jinja_env.get_template(template_name)
+
+        # Run the hot user queries once so SQLAlchemy caches their compiled SQL on the engine.
+        # This is only an optimisation, so a missing table (init-db not run yet) must not stop the server booting
+        try:
+            db.session.get(User, 0)
+            User.query.filter((User.username == '') | (User.email == '')).first()
+            UserGame.query.filter_by(user_id=0, game_id=0).first()
+            UserGame.query.filter_by(user_id=0).order_by(UserGame.date_added.desc()).all()
+        except OperationalError as e:
+            app.logger.warning("Skipped warming up user queries (has 'flask --app app init-db' been run?): %s", e)
+        finally:
+            db.session.remove()
+
+        # Close pooled connections so no worker inherits the master's sqlite handles
+        db.engine.dispose()
 
 # --- Application Entry Point ---
 if __name__ == '__main__':
-    app.run()  # Turn off debug = True in production
\ No newline at end of file
+    create_app().run()  # Turn off debug = True in production
\ No newline at end of file
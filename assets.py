@@ -0,0 +1,157 @@
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import re
+
+import click
+from flask import Blueprint, abort, current_app, request, send_from_directory, url_for
+from flask.cli import with_appcontext
+
+try:
+    import brotli  # Optional - without it only .gz variants are built
+except ImportError:
+    brotli = None
+
+# Static files that go through the build step (paths relative to the static folder)
+ASSET_SOURCES = ('css/style.css', 'js/main.js')
+MANIFEST_NAME = 'manifest.json'
+# What build_assets() names its output, e.g. css/style.3f2a9c1b7d4e.css
+HASHED_NAME = re.compile(r'^[\w./-]+\.[0-9a-f]{12}\.\w+$')
+
+# Precompressed variants in order of preference, as (Content-Encoding, file suffix)
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+assets_bp = Blueprint('assets', __name__, url_prefix='/assets')
+
+
+def get_dist_folder(app):
+    """Returns the folder the build step writes fingerprinted assets to."""
+    return os.path.join(app.static_folder, app.config['ASSET_DIST_FOLDER'])
+
+
+def build_assets(static_folder, dist_folder, prune=False):
+    """
+    Copies each file in ASSET_SOURCES to dist_folder under a content-hashed name
+    (e.g. css/style.3f2a9c1b7d4e.css), writes .gz and .br siblings next to it
+    and records the mapping in manifest.json. Returns the manifest.
+
+    Earlier builds are left in place: running servers and cached pages still link to them.
+    With prune=True, files from builds older than the one being replaced are deleted.
+    """
+    previous_manifest = load_manifest(dist_folder)
+    manifest = {}
+    for source in ASSET_SOURCES:
+        with open(os.path.join(static_folder, source), 'rb') as f:
+            content = f.read()
+        digest = hashlib.sha256(content).hexdigest()[:12]
+        stem, ext = os.path.splitext(source)
+        hashed_name = f'{stem}.{digest}{ext}'
+
+        target = os.path.join(dist_folder, hashed_name)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with open(target, 'wb') as f:
+            f.write(content)
+        # mtime=0 keeps the .gz output identical between builds of the same file
+        with open(target + '.gz', 'wb') as f:
+            f.write(gzip.compress(content, compresslevel=9, mtime=0))
+        if brotli is not None:
+            with open(target + '.br', 'wb') as f:
+                f.write(brotli.compress(content, quality=11))
+
+        manifest[source] = hashed_name
+
+    # Write the manifest to a temporary file first so a server reading it never sees half of it
+    manifest_path = os.path.join(dist_folder, MANIFEST_NAME)
+    with open(manifest_path + '.tmp', 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(manifest_path + '.tmp', manifest_path)
+
+    if prune:
+        prune_assets(dist_folder, keep=set(manifest.values()) | set(previous_manifest.values()))
+    return manifest
+
+
+def prune_assets(dist_folder, keep):
+    """Deletes fingerprinted files (and their .gz/.br siblings) in dist_folder whose names aren't in keep."""
+    for root, _, files in os.walk(dist_folder):
+        for name in files:
+            path = os.path.join(root, name)
+            hashed_name = os.path.relpath(path, dist_folder).replace(os.sep, '/')
+            for _, suffix in ENCODINGS:
+                hashed_name = hashed_name.removesuffix(suffix)
+            if HASHED_NAME.match(hashed_name) and hashed_name not in keep:
+                os.remove(path)
+
+
+def load_manifest(dist_folder):
+    """Reads manifest.json from dist_folder. Returns an empty manifest if the build step hasn't been run."""
+    try:
+        with open(os.path.join(dist_folder, MANIFEST_NAME)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def get_asset_manifest():
+    """Returns the asset manifest for the current app, reading it on first use."""
+    manifest = current_app.extensions.get('asset_manifest')
+    if manifest is None:
+        manifest = current_app.extensions['asset_manifest'] = load_manifest(get_dist_folder(current_app))
+    return manifest
+
+
+@assets_bp.app_template_global()
+def asset_url(endpoint, **values):
+    """
+    Drop-in replacement for url_for() in templates.
+    Static files that have a fingerprinted build are pointed at it, everything else goes through url_for() as normal.
+    """
+    if endpoint == 'static':
+        hashed_name = get_asset_manifest().get(values.get('filename'))
+        if hashed_name:
+            values['filename'] = hashed_name
+            return url_for('assets.asset', **values)
+    return url_for(endpoint, **values)
+
+
+@assets_bp.route('/<path:filename>')
+def asset(filename):
+    """
+    Serves a fingerprinted asset, picking a precompressed variant the browser accepts.
+    The name changes whenever the content does, so the response can be cached forever.
+    Files from earlier builds are served too, for pages that were rendered before the last build.
+    """
+    if not HASHED_NAME.match(filename) or '..' in filename.split('/'):
+        abort(404)
+
+    dist_folder = get_dist_folder(current_app)
+    # Content-Type comes from the original name, not the .gz/.br suffix
+    mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    served_name, content_encoding = filename, None
+    for encoding, suffix in ENCODINGS:
+        if request.accept_encodings[encoding] and os.path.exists(os.path.join(dist_folder, filename + suffix)):
+            served_name, content_encoding = filename + suffix, encoding
+            break
+
+    # download_name keeps Content-Disposition on the decoded name rather than the .gz/.br one
+    response = send_from_directory(dist_folder, served_name, mimetype=mimetype, download_name=os.path.basename(filename),
+                                   max_age=current_app.config['ASSET_MAX_AGE'])
+    if content_encoding:
+        response.headers['Content-Encoding'] = content_encoding
+    response.vary.add('Accept-Encoding')
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
+
+
+@click.command('build-assets')
+@click.option('--prune', is_flag=True, help='Delete files from builds older than the one being replaced.')
+@with_appcontext
+def build_assets_command(prune):
+    """Builds fingerprinted, precompressed copies of the static CSS and JS."""
+    manifest = build_assets(current_app.static_folder, get_dist_folder(current_app), prune=prune)
+    current_app.extensions['asset_manifest'] = manifest
+    for source, hashed_name in sorted(manifest.items()):
+        click.echo(f'{source} -> {hashed_name}')
@@ -0,0 +1,84 @@
+"""
+Benchmark for streamed vs buffered rendering of the home page.
+
+Fills the catalog with copies of the real games to get a large page, then requests it
+through the full WSGI stack (including the compression middleware) and reports:
+- time to first byte (first non-empty body chunk)
+- total time to read the whole body
+- peak Python memory allocated while handling the request
+- bytes sent
+
+Run with: python bench_streaming.py [number of games ...]
+"""
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from werkzeug.test import EnvironBuilder
+
+from app import create_app
+from catalog import Catalog, load_catalog
+
+REPEATS = 5
+
+
+def make_app(stream, games):
+    """Builds an app with STREAM_TEMPLATES on or off and a catalog of (at least) this many games."""
+    app = create_app({
+        'STREAM_TEMPLATES': stream,
+        # The home page doesn't use the user database, but keep the benchmark away from the real one
+        'SQLALCHEMY_DATABASE_URI': f'sqlite:///{tempfile.gettempdir()}/bench_streaming.db',
+    })
+    real_games = load_catalog(app.config['POPULAR_GAMES_DATABASE']).games
+    copies = [dict(real_games[i % len(real_games)], game_id=i + 1) for i in range(games)]
+    app.extensions['catalog'] = Catalog(copies)
+    return app
+
+
+def request_home(app):
+    """Requests the home page and returns (time to first byte, total time, bytes sent)."""
+    environ = EnvironBuilder(path='/', headers={'Accept-Encoding': 'gzip'}).get_environ()
+    start = time.perf_counter()
+    first_byte = None
+    sent = 0
+    body = app(environ, lambda status, headers, exc_info=None: None)
+    try:
+        for chunk in body:
+            if chunk and first_byte is None:
+                first_byte = time.perf_counter() - start
+            sent += len(chunk)
+    finally:
+        if hasattr(body, 'close'):
+            body.close()
+    return first_byte, time.perf_counter() - start, sent
+
+
+def peak_memory(app):
+    """Returns the peak memory (bytes) Python allocated while handling one request."""
+    tracemalloc.start()
+    try:
+        request_home(app)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main(sizes):
+    print(f"{'games':>7} {'mode':>9} {'ttfb ms':>9} {'total ms':>9} {'peak KiB':>9} {'sent KiB':>9}")
+    for games in sizes:
+        for stream in (False, True):
+            app = make_app(stream, games)
+            request_home(app)  # Warm-up: template compile, first request setup
+            runs = [request_home(app) for _ in range(REPEATS)]
+            ttfb = statistics.median(run[0] for run in runs) * 1000
+            total = statistics.median(run[1] for run in runs) * 1000
+            peak = peak_memory(app) / 1024
+            sent = runs[0][2] / 1024
+            mode = 'streamed' if stream else 'buffered'
+            print(f"{games:>7} {mode:>9} {ttfb:>9.1f} {total:>9.1f} {peak:>9.0f} {sent:>9.0f}")
+
+
+if __name__ == '__main__':
+    main([int(size) for size in sys.argv[1:]] or [1000, 5000, 20000])
@@ -0,0 +1,193 @@
+from datetime import datetime
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+import re
+import sqlite3
+
+# Prices are normalised to integer minor units (cents) of this currency so they can be compared directly
+CATALOG_CURRENCY = 'NZD'
+# Local conversion table: how many CATALOG_CURRENCY units one unit of each currency is worth.
+# Fixed rates - they only need to be good enough for ordering, not for charging anyone.
+CURRENCY_RATES = {
+    'NZD': Decimal('1'),
+    'AUD': Decimal('1.09'),
+    'USD': Decimal('1.68'),
+    'EUR': Decimal('1.82'),
+    'GBP': Decimal('2.13'),
+}
+
+# Sort orders precomputed for every catalog, as sort name -> game key (None sorts last)
+SORT_KEYS = {
+    'price': lambda game: game['price_minor'],
+    'score': lambda game: game['score'],
+    'release_date': lambda game: game['released'],
+    'title': lambda game: game['title'].casefold(),
+}
+
+# --- Typed values parsed from the TEXT columns ---
+def parse_score(score_text):
+    """Converts a metacritic_score string (e.g. '97') to an int, or None if it isn't a number."""
+    try:
+        return int(str(score_text).strip())
+    except (TypeError, ValueError):
+        return None
+
+def parse_price(price_text, currency):
+    """
+    Converts a price string (e.g. '$80' or 'Free') to integer minor units of CATALOG_CURRENCY.
+    A missing currency is taken to be CATALOG_CURRENCY. Returns None if the price can't be understood.
+    Both '1,234.50' and '1.234,50' styles are accepted - a comma followed by one or two digits at the end is a decimal comma.
+    Thousands grouped with spaces ('1 234,50', including non-breaking spaces) are accepted too.
+    """
+    if not price_text:
+        return None
+    price_text = price_text.strip()
+    if price_text.lower() == 'free':
+        return 0
+    rate = CURRENCY_RATES.get((currency or CATALOG_CURRENCY).strip().upper())
+    # A space only belongs to the amount if another digit follows it
+    amount = re.search(r'\d(?:[\d.,]|[ \u00a0\u202f](?=\d))*', price_text)
+    if rate is None or amount is None:
+        return None
+    number = amount.group().rstrip('.,')
+    space_grouped = re.fullmatch(r'(\d{1,3}(?:[ \u00a0\u202f]\d{3})+)(?:[.,](\d{1,2}))?', number)
+    if space_grouped:
+        whole, fraction = space_grouped.groups()
+        number = re.sub(r'\D', '', whole) + (f'.{fraction}' if fraction else '')
+    elif re.search(r'\s', number):
+        return None  # Spaces that aren't thousands groups, e.g. '12 34'
+    elif re.fullmatch(r'\d+(?:\.\d+)?|\d{1,3}(?:,\d{3})+(?:\.\d+)?', number):
+        number = number.replace(',', '')  # Commas are thousands separators
+    elif re.fullmatch(r'\d+,\d{1,2}|\d{1,3}(?:\.\d{3})+,\d{1,2}', number):
+        number = number.replace('.', '').replace(',', '.')  # Decimal comma, dots are thousands separators
+    else:
+        return None  # Ambiguous, e.g. '1,2345'
+    try:
+        minor_units = Decimal(number) * rate * 100
+    except InvalidOperation:
+        return None
+    return int(minor_units.quantize(Decimal('1'), rounding=ROUND_HALF_UP))
+
+def parse_release_date(date_text):
+    """Converts a YYYY-MM-DD release_date string to a date, or None if it isn't a valid date."""
+    try:
+        return datetime.strptime(date_text, "%Y-%m-%d").date()
+    except (TypeError, ValueError):
+        return None
+
+
+# Big SQL query for fetching game data with all its related information (platforms, ratings, etc.)
+GAME_SELECT = """
+SELECT
+    g.game_id,
+    g.title,
+    g.genre,
+    g.release_date,
+    g.metacritic_score,
+    g.description,
+    d.name AS developer,
+    pub.name AS publisher,
+    ar.rating AS age_rating,
+    ar.reason AS age_rating_reason,
+    i.cover_image,
+    i.image_url,
+    i.image_url2,
+    i.image_url3,
+    pr.price AS price,
+    pr.currency AS currency,
+    p1.platform_name AS platform_name1,
+    p2.platform_name AS platform_name2,
+    p3.platform_name AS platform_name3,
+    p4.platform_name AS platform_name4,
+    p5.platform_name AS platform_name5,
+    p6.platform_name AS platform_name6,
+    p7.platform_name AS platform_name7,
+    p8.platform_name AS platform_name8
+FROM games g
+JOIN developers d ON g.developer_id = d.developer_id
+JOIN publishers pub ON g.publisher_id = pub.publisher_id
+JOIN age_ratings ar ON g.age_rating_id = ar.age_rating_id
+JOIN images i ON g.game_id = i.game_id
+LEFT JOIN prices pr ON g.game_id = pr.game_id
+LEFT JOIN game_platforms gp ON g.game_id = gp.game_id
+LEFT JOIN platforms p1 ON gp.platform_id = p1.platform_id
+LEFT JOIN platforms p2 ON gp.platform_id2 = p2.platform_id
+LEFT JOIN platforms p3 ON gp.platform_id3 = p3.platform_id
+LEFT JOIN platforms p4 ON gp.platform_id4 = p4.platform_id
+LEFT JOIN platforms p5 ON gp.platform_id5 = p5.platform_id
+LEFT JOIN platforms p6 ON gp.platform_id6 = p6.platform_id
+LEFT JOIN platforms p7 ON gp.platform_id7 = p7.platform_id
+LEFT JOIN platforms p8 ON gp.platform_id8 = p8.platform_id
+"""
+
+
+def build_game_dict(game_row):
+    """
+    Converts a GAME_SELECT row into a dictionary for the templates.
+    Adds 'platforms_display' with the distinct platforms for the game, plus typed copies of the
+    TEXT columns: 'score' (int), 'price_minor' (int cents of CATALOG_CURRENCY) and 'released' (date).
+    """
+    game_dict = dict(game_row)
+    platforms_list = []
+    # Collect platforms from potentially multiple platform_nameX columns
+    for i in range(1, 9):
+        platform_key = f'platform_name{i}'
+        if game_dict.get(platform_key):
+            platforms_list.append(game_dict[platform_key])
+    # Use set to remove duplicate platforms
+    game_dict['platforms_display'] = list(set(platforms_list))
+    # The original strings are kept for display, these are for sorting and filtering
+    game_dict['score'] = parse_score(game_dict['metacritic_score'])
+    game_dict['price_minor'] = parse_price(game_dict.get('price'), game_dict.get('currency'))
+    game_dict['released'] = parse_release_date(game_dict['release_date'])
+    return game_dict
+
+
+class Catalog:
+    """
+    Read-only, in-memory snapshot of every game in Popular_Games.db.
+    Built once per process (or once in the gunicorn master before fork) and shared by all requests.
+    """
+
+    def __init__(self, games):
+        self.games = games
+        self.by_id = {game['game_id']: game for game in games}
+        # Every sort order is worked out once here, so sorting a page is just picking a list.
+        # Games with a missing value go last in both directions; ties keep catalog order.
+        self.sort_orders = {}
+        for sort_name, sort_key in SORT_KEYS.items():
+            ascending = sorted(games, key=lambda game: (sort_key(game) is None, sort_key(game)))
+            descending = sorted(games, key=lambda game: (sort_key(game) is not None, sort_key(game)), reverse=True)
+            self.sort_orders[sort_name] = (ascending, descending)
+
+    def __len__(self):
+        return len(self.games)
+
+    def get(self, game_id):
+        """Returns the game with this ID, or None if it doesn't exist."""
+        return self.by_id.get(game_id)
+
+    def ordered(self, sort_name, descending=False):
+        """
+        Returns all games in a precomputed sort order (one of SORT_KEYS).
+        The list is shared, so callers should slice it rather than change it.
+        """
+        ascending_games, descending_games = self.sort_orders[sort_name]
+        return descending_games if descending else ascending_games
+
+    def lookup(self, game_ids):
+        """Yields the games for these IDs in the same order, skipping unknown IDs."""
+        return (self.by_id[game_id] for game_id in game_ids if game_id in self.by_id)
+
+
+def load_catalog(database_path):
+    """
+    Reads the whole games catalog from the Popular_Games.db database.
+    The connection is opened read-only and closed straight away, so nothing is left open to be inherited by forked workers.
+    """
+    conn = sqlite3.connect(f'file:{database_path}?mode=ro', uri=True)
+    conn.row_factory = sqlite3.Row  # Enable dictionary-like access to columns
+    try:
+        games = [build_game_dict(row) for row in conn.execute(GAME_SELECT)]
+    finally:
+        conn.close()
+    return Catalog(games)
@@ -0,0 +1,132 @@
+import zlib
+
+from werkzeug.http import parse_accept_header
+from werkzeug.wsgi import ClosingIterator
+
+try:
+    import brotli  # Optional - without it responses are only gzipped
+except ImportError:
+    brotli = None
+
+# Content types worth compressing - images, fonts etc. are already compressed
+COMPRESSIBLE_TYPES = ('text/', 'application/json', 'application/javascript', 'image/svg+xml')
+
+
+class CompressionMiddleware:
+    """
+    WSGI middleware that gzip/brotli compresses responses on the fly.
+
+    The body is compressed as it is produced, so streamed pages stay streamed: the compressor is
+    flushed after the first chunk (so the browser gets the <head> and can start loading CSS)
+    and then every time chunk_size bytes have gone in. Nothing is ever buffered in full.
+    Responses that already have a Content-Encoding (e.g. the precompressed /assets files) are left alone.
+    A compressed response is a different representation from the original, so its ETag is made weak
+    and Accept-Ranges is dropped - byte ranges of the uncompressed file must not be spliced into it.
+    """
+
+    def __init__(self, app, min_size=500, chunk_size=16 * 1024, gzip_level=6, brotli_quality=5):
+        self.app = app
+        self.min_size = min_size
+        self.chunk_size = chunk_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    def __call__(self, environ, start_response):
+        encoding = self.choose_encoding(environ.get('HTTP_ACCEPT_ENCODING', ''))
+        if encoding is None or environ.get('REQUEST_METHOD') == 'HEAD':
+            return self.app(environ, start_response)
+
+        # A weak validator (like the ETags given to compressed responses) must never satisfy If-Range,
+        # but Werkzeug accepts one, so drop the Range to make sure a full response is sent instead
+        if 'HTTP_RANGE' in environ and environ.get('HTTP_IF_RANGE', '').startswith('W/'):
+            environ = {name: value for name, value in environ.items() if name != 'HTTP_RANGE'}
+
+        # Filled in by start_response - the headers and the body have to agree on whether it's compressed
+        state = {'started': False, 'compressing': False}
+
+        def compressing_start_response(status, headers, exc_info=None):
+            state['started'] = True
+            state['compressing'] = self.should_compress(status, headers)
+            if state['compressing']:
+                headers = [(name, self.weaken_etag(value) if name.lower() == 'etag' else value)
+                           for name, value in headers
+                           if name.lower() not in ('content-length', 'accept-ranges', 'vary')] + [
+                    ('Content-Encoding', encoding),
+                    ('Vary', self.merge_vary(headers)),
+                ]
+            return start_response(status, headers, exc_info)
+
+        app_iter = self.app(environ, compressing_start_response)
+        if state['started'] and not state['compressing']:
+            return app_iter
+        # Apps may call start_response lazily on the first iteration, so the body decides per chunk as well.
+        # WSGI requires the app's close() to be called (Flask tears the request down there), even if the body is never read
+        return ClosingIterator(self.compress(app_iter, encoding, state), getattr(app_iter, 'close', None))
+
+    def choose_encoding(self, accept_encoding):
+        """Picks 'br' or 'gzip' from an Accept-Encoding header, or None if the client accepts neither."""
+        accepted = parse_accept_header(accept_encoding)
+        if brotli is not None and accepted['br']:
+            return 'br'
+        if accepted['gzip']:
+            return 'gzip'
+        return None
+
+    def should_compress(self, status, headers):
+        """Only full 200 responses of a text-like type that aren't tiny or already encoded are compressed."""
+        if not status.startswith('200'):
+            return False
+        headers = {name.lower(): value for name, value in headers}
+        if 'content-encoding' in headers or 'no-transform' in headers.get('cache-control', ''):
+            return False
+        if not headers.get('content-type', '').startswith(COMPRESSIBLE_TYPES):
+            return False
+        # Streamed responses have no Content-Length and are assumed to be large
+        content_length = headers.get('content-length')
+        return content_length is None or int(content_length) >= self.min_size
+
+    @staticmethod
+    def weaken_etag(etag):
+        """Turns a strong ETag into a weak one, since the compressed bytes differ from what it was made for."""
+        return etag if etag.startswith('W/') else f'W/{etag}'
+
+    @staticmethod
+    def merge_vary(headers):
+        """Adds Accept-Encoding to whatever the response already varies on (e.g. Cookie)."""
+        vary = [value.strip() for name, header in headers if name.lower() == 'vary'
+                for value in header.split(',') if value.strip()]
+        if 'accept-encoding' not in (value.lower() for value in vary):
+            vary.append('Accept-Encoding')
+        return ', '.join(vary)
+
+    def new_compressor(self, encoding):
+        """Returns (compress, flush, finish) functions for a fresh compressor."""
+        if encoding == 'br':
+            compressor = brotli.Compressor(quality=self.brotli_quality)
+            return compressor.process, compressor.flush, compressor.finish
+        compressor = zlib.compressobj(self.gzip_level, zlib.DEFLATED, 31)  # 31 = gzip header and trailer
+        return compressor.compress, lambda: compressor.flush(zlib.Z_SYNC_FLUSH), compressor.flush
+
+    def compress(self, app_iter, encoding, state):
+        """Yields the compressed body chunk by chunk, flushing so the client never waits on a full page."""
+        compress, flush, finish = self.new_compressor(encoding)
+        # Templates stream lots of tiny pieces; collecting them up to chunk_size and compressing
+        # them in one call is much cheaper than calling the compressor for each one
+        pending = []
+        pending_size = 0
+        first_chunk = True
+        for chunk in app_iter:
+            if not state['compressing']:
+                yield chunk
+                continue
+            if not chunk:
+                continue
+            pending.append(chunk)
+            pending_size += len(chunk)
+            if first_chunk or pending_size >= self.chunk_size:
+                yield compress(b''.join(pending)) + flush()
+                pending = []
+                pending_size = 0
+                first_chunk = False
+        if state['compressing']:
+            yield compress(b''.join(pending)) + finish()
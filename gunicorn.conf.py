@@ -0,0 +1,20 @@
+# Gunicorn settings - run with: gunicorn
+# The app is built and warmed up once in the master, then workers are forked from it
+# so they start with the catalog and compiled templates already in (shared) memory.
+import gc
+import os
+
+# Deployment settings passed to the app factory - STREAM_TEMPLATES=0 turns off streamed pages (see README)
+app_config = {'STREAM_TEMPLATES': os.environ.get('STREAM_TEMPLATES', '1') != '0'}
+wsgi_app = f'app:create_app({app_config!r})'
+preload_app = True
+workers = int(os.environ.get('WEB_CONCURRENCY', 4))
+bind = os.environ.get('GUNICORN_BIND', '127.0.0.1:8000')
+
+def when_ready(server):
+    """Runs in the master after the app is loaded and before any worker is forked."""
+    from app import warm_up
+    warm_up(server.app.wsgi())
+    # Move everything loaded so far out of the garbage collector's reach,
+    # otherwise gc passes in the workers write to these pages and undo copy-on-write sharing
+    gc.freeze()